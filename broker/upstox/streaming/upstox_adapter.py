@@ -1,10 +1,11 @@
 # broker/upstox/streaming/upstox_adapter.py
 import asyncio
+import os
+import sys
 import threading
-import json
 import logging
+from collections import deque
 from typing import Dict, Any, Optional
-from datetime import datetime
 
 from websocket_proxy.base_adapter import BaseBrokerWebSocketAdapter
 from websocket_proxy.mapping import SymbolMapper
@@ -12,6 +13,67 @@ from .upstox_client import UpstoxWebSocketClient
 from database.auth_db import get_auth_token
 
 
+def _create_event_loop() -> asyncio.AbstractEventLoop:
+    """Create the event loop used for WebSocket I/O.
+
+    Set UPSTOX_WS_UVLOOP=1 on Linux to run the feed on uvloop, which
+    batches syscall work and lowers tail latency on high-rate feeds.
+    Falls back to the stdlib loop when uvloop is not installed.
+    """
+    logger = logging.getLogger("upstox_websocket")
+    if os.getenv("UPSTOX_WS_UVLOOP", "0") == "1" and sys.platform == "linux":
+        try:
+            import uvloop
+            logger.info("Using uvloop event loop for WebSocket I/O")
+            return uvloop.new_event_loop()
+        except ImportError:
+            logger.warning("UPSTOX_WS_UVLOOP=1 but uvloop is not installed; using default event loop")
+    return asyncio.new_event_loop()
+
+
+class _SharedEventLoop:
+    """One asyncio loop thread multiplexing all Upstox adapter connections.
+
+    Each adapter previously spawned its own event loop thread, costing a
+    scheduler entry and a private stack per connected user. The clients are
+    coroutine-based, so they all multiplex onto a single daemon loop thread
+    that is started lazily and lives for the process lifetime.
+    """
+
+    loop: Optional[asyncio.AbstractEventLoop] = None
+    thread: Optional[threading.Thread] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls) -> asyncio.AbstractEventLoop:
+        """Return the shared loop, starting its thread on first use.
+
+        If the loop thread ever dies, a replacement is started; adapters
+        resolve the loop through this method on every use (rather than
+        caching it), so they schedule onto the live loop afterwards.
+        """
+        with cls._lock:
+            if cls.loop is None or not cls.thread or not cls.thread.is_alive():
+                if cls.loop is not None:
+                    logging.getLogger("upstox_websocket").error(
+                        "Shared WebSocket event loop thread died; starting a replacement. "
+                        "Existing connections must reconnect."
+                    )
+                    try:
+                        cls.loop.close()
+                    except Exception:
+                        pass
+                cls.loop = _create_event_loop()
+                cls.thread = threading.Thread(target=cls._run, daemon=True, name="upstox-ws-loop")
+                cls.thread.start()
+            return cls.loop
+
+    @classmethod
+    def _run(cls):
+        asyncio.set_event_loop(cls.loop)
+        cls.loop.run_forever()
+
+
 class UpstoxWebSocketAdapter(BaseBrokerWebSocketAdapter):
     """
     Upstox V3 WebSocket adapter implementation.
@@ -21,18 +83,38 @@ class UpstoxWebSocketAdapter(BaseBrokerWebSocketAdapter):
     - Processes protobuf messages decoded to dict format
     - Manages subscriptions and market data publishing
     """
-    
+
+    # Supported subscription modes: 1 (LTP), 2 (Quote), 3 (Depth).
+    # frozenset membership is a single hash probe and immutable at class level
+    VALID_MODES = frozenset((1, 2, 3))
+    _MODE_TOPICS = {1: 'LTP', 2: 'QUOTE', 3: 'DEPTH'}
+    _UPSTOX_MODES = {1: "ltpc", 2: "full", 3: "full"}
+
     def __init__(self):
         super().__init__()
         self.logger = logging.getLogger("upstox_websocket")
         self.ws_client: Optional[UpstoxWebSocketClient] = None
-        self.event_loop: Optional[asyncio.AbstractEventLoop] = None
-        self.ws_thread: Optional[threading.Thread] = None
+        self._loop_attached = False
+        # Read-mostly: writers replace the dict under self.lock (copy on
+        # write); the per-tick reader loops take a plain snapshot reference
+        # and never need the lock
         self.subscriptions: Dict[str, Dict[str, Any]] = {}
         self.market_status: Dict[str, Any] = {}
         self.connected = False
         self.running = False
         self.lock = threading.Lock()  # Add threading lock for subscription management
+        # Coalesce subscribe/unsubscribe bursts into one WebSocket frame each
+        # instead of paying per-frame TCP/TLS/WS overhead per instrument
+        self._pending_subs: Dict[str, list] = {}
+        self._pending_unsubs: list = []
+        self._batch_timer: Optional[threading.Timer] = None
+        self._batch_window = 0.01  # seconds
+        # Single-producer/single-consumer ring between the websocket reader
+        # (event loop) and the publishing thread; deque append/popleft are
+        # thread-safe and lock-free at the Python level
+        self._feed_ring: deque = deque(maxlen=65536)
+        self._feed_event = threading.Event()
+        self._consumer_thread: Optional[threading.Thread] = None
 
     def initialize(self, broker_name: str, user_id: str, auth_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Initialize the adapter with authentication data"""
@@ -70,6 +152,7 @@ class UpstoxWebSocketAdapter(BaseBrokerWebSocketAdapter):
             if success:
                 self.connected = True
                 self.running = True
+                self._start_feed_consumer()
                 self.logger.info("Connected to Upstox WebSocket")
                 return self._create_success_response("Connected to Upstox WebSocket")
             else:
@@ -82,7 +165,7 @@ class UpstoxWebSocketAdapter(BaseBrokerWebSocketAdapter):
     def subscribe(self, symbol: str, exchange: str, mode: int = 2, depth_level: int = 0) -> Dict[str, Any]:
         """Subscribe to market data with Upstox-specific implementation following Angel's pattern"""
         # Validate mode
-        if mode not in [1, 2, 3]:
+        if mode not in self.VALID_MODES:
             return self._create_error_response("INVALID_MODE", 
                                               f"Invalid mode {mode}. Must be 1 (LTP), 2 (Quote), or 3 (Depth)")
         
@@ -100,54 +183,40 @@ class UpstoxWebSocketAdapter(BaseBrokerWebSocketAdapter):
 
         instrument_key = self._create_instrument_key(token_info)
         
-        # Generate unique correlation ID like Angel does
-        correlation_id = f"{symbol}_{exchange}_{mode}"
-        
+        # Generate unique correlation ID like Angel does; interned so the
+        # per-tick subscription lookups hit the identity-compare fast path
+        correlation_id = sys.intern(f"{symbol}_{exchange}_{mode}")
+
         # Check for duplicate subscriptions using correlation_id
-        with self.lock:
-            if correlation_id in self.subscriptions:
-                self.logger.info(f"Already subscribed to {symbol} on {exchange} with mode {mode}")
-                return self._create_success_response(f"Already subscribed to {symbol} on {exchange}")
-        
+        if correlation_id in self.subscriptions:
+            self.logger.info(f"Already subscribed to {symbol} on {exchange} with mode {mode}")
+            return self._create_success_response(f"Already subscribed to {symbol} on {exchange}")
+
         subscription_info = {
             'symbol': symbol,
             'exchange': exchange,
             'mode': mode,
             'depth_level': depth_level,
             'token': token_info['token'],
-            'instrument_key': instrument_key
+            'instrument_key': instrument_key,
+            # Precomputed so the per-tick publish path does not rebuild it
+            'topic': self._create_topic(exchange, symbol, mode)
         }
 
-        # Store subscription before sending request (Angel pattern)
+        # Store subscription before sending request (Angel pattern);
+        # copy-on-write so concurrent readers never see a half-updated dict
         with self.lock:
-            self.subscriptions[correlation_id] = subscription_info
+            updated = dict(self.subscriptions)
+            updated[correlation_id] = subscription_info
+            self.subscriptions = updated
             self.logger.info(f"Stored subscription: {correlation_id} -> {subscription_info}")
         
-        # Subscribe if connected (Angel pattern)
+        # Subscribe if connected; requests are coalesced into batched frames
         if self.connected and self.ws_client:
-            try:
-                future = asyncio.run_coroutine_threadsafe(
-                    self.ws_client.subscribe([instrument_key], self._get_upstox_mode(mode, depth_level)),
-                    self.event_loop
-                )
-                
-                # Use shorter timeout like Angel (no retry loop in subscribe method)
-                if future.result(timeout=5):
-                    self.logger.info(f"Subscribed to {symbol} on {exchange} (key={instrument_key})")
-                    return self._create_success_response(f"Subscribed to {symbol} on {exchange}")
-                else:
-                    # Clean up on failure
-                    with self.lock:
-                        self.subscriptions.pop(correlation_id, None)
-                    return self._create_error_response("SUBSCRIBE_FAILED", f"Failed to subscribe to {symbol} on {exchange}")
-                    
-            except Exception as e:
-                self.logger.error(f"Error subscribing to {symbol}.{exchange}: {e}")
-                # Clean up on error
-                with self.lock:
-                    self.subscriptions.pop(correlation_id, None)
-                return self._create_error_response("SUBSCRIPTION_ERROR", str(e))
-        
+            self._queue_subscription(instrument_key, self._get_upstox_mode(mode, depth_level))
+            self.logger.info(f"Queued subscription for {symbol} on {exchange} (key={instrument_key})")
+            return self._create_success_response(f"Subscribed to {symbol} on {exchange}")
+
         # Return success response (subscription will be processed when connected)
         return self._create_success_response(
             f"Subscription requested for {symbol}.{exchange}",
@@ -170,27 +239,21 @@ class UpstoxWebSocketAdapter(BaseBrokerWebSocketAdapter):
             instrument_key = self._create_instrument_key(token_info)
             
             # Generate unique correlation ID like Angel does
-            correlation_id = f"{symbol}_{exchange}_{mode}"
+            correlation_id = sys.intern(f"{symbol}_{exchange}_{mode}")
             
             # Check for subscription using correlation_id
-            with self.lock:
-                if correlation_id not in self.subscriptions:
-                    self.logger.info(f"Not subscribed to {symbol} on {exchange} with mode {mode}")
-                    return self._create_success_response(f"Not subscribed to {symbol} on {exchange}")
-        
-            # Send unsubscription request
-            future = asyncio.run_coroutine_threadsafe(
-                self.ws_client.unsubscribe([instrument_key]),
-                self.event_loop
-            )
+            if correlation_id not in self.subscriptions:
+                self.logger.info(f"Not subscribed to {symbol} on {exchange} with mode {mode}")
+                return self._create_success_response(f"Not subscribed to {symbol} on {exchange}")
 
-            if future.result(timeout=5):
-                with self.lock:
-                    self.subscriptions.pop(correlation_id, None)
-                self.logger.info(f"Unsubscribed from {symbol} on {exchange}")
-                return self._create_success_response(f"Unsubscribed from {symbol} on {exchange}")
-            else:
-                return self._create_error_response("UNSUBSCRIBE_FAILED", f"Failed to unsubscribe from {symbol} on {exchange}")
+            # Queue unsubscription request; sent in the next batched frame
+            with self.lock:
+                updated = dict(self.subscriptions)
+                updated.pop(correlation_id, None)
+                self.subscriptions = updated
+            self._queue_unsubscription(instrument_key)
+            self.logger.info(f"Unsubscribed from {symbol} on {exchange}")
+            return self._create_success_response(f"Unsubscribed from {symbol} on {exchange}")
 
         except Exception as e:
             self.logger.error(f"Unsubscribe error: {e}")
@@ -202,6 +265,13 @@ class UpstoxWebSocketAdapter(BaseBrokerWebSocketAdapter):
             self.running = False
             self.connected = False
 
+            with self.lock:
+                if self._batch_timer:
+                    self._batch_timer.cancel()
+                    self._batch_timer = None
+                self._pending_subs = {}
+                self._pending_unsubs = []
+
             if self.ws_client and self.event_loop:
                 future = asyncio.run_coroutine_threadsafe(
                     self.ws_client.disconnect(),
@@ -209,7 +279,12 @@ class UpstoxWebSocketAdapter(BaseBrokerWebSocketAdapter):
                 )
                 future.result(timeout=5)
 
-            self._stop_event_loop()
+            # Wake and drain the feed consumer thread
+            self._feed_event.set()
+            if self._consumer_thread and self._consumer_thread.is_alive():
+                self._consumer_thread.join(timeout=5)
+
+            # The event loop is shared with other adapters and stays running
             self.cleanup_zmq()
             self.logger.info("Disconnected from Upstox WebSocket")
 
@@ -223,19 +298,22 @@ class UpstoxWebSocketAdapter(BaseBrokerWebSocketAdapter):
             return auth_data['auth_token']
         return get_auth_token(user_id)
 
+    @property
+    def event_loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        """Current shared event loop, or None before connect().
+
+        Resolved on every access instead of cached so that if the shared
+        loop thread dies and is replaced, this adapter schedules onto the
+        live replacement rather than a dead loop.
+        """
+        if not self._loop_attached:
+            return None
+        return _SharedEventLoop.get()
+
     def _start_event_loop(self):
-        """Start event loop in a separate thread"""
-        if not self.event_loop or not self.ws_thread or not self.ws_thread.is_alive():
-            self.event_loop = asyncio.new_event_loop()
-            self.ws_thread = threading.Thread(target=self._run_event_loop, daemon=True)
-            self.ws_thread.start()
-            self.logger.info("Started event loop thread")
-
-    def _run_event_loop(self):
-        """Run the event loop in a separate thread"""
-        if self.event_loop:
-            asyncio.set_event_loop(self.event_loop)
-            self.event_loop.run_forever()
+        """Attach this adapter to the shared event loop thread"""
+        _SharedEventLoop.get()
+        self._loop_attached = True
 
     def _connect_websocket(self) -> bool:
         """Connect to WebSocket and return success status"""
@@ -248,13 +326,54 @@ class UpstoxWebSocketAdapter(BaseBrokerWebSocketAdapter):
         )
         return future.result(timeout=10)
 
-    def _stop_event_loop(self):
-        """Stop event loop and wait for thread to finish"""
-        if self.event_loop:
-            self.event_loop.call_soon_threadsafe(self.event_loop.stop)
-            
-        if self.ws_thread and self.ws_thread.is_alive():
-            self.ws_thread.join(timeout=5)
+    def _queue_subscription(self, instrument_key: str, upstox_mode: str) -> None:
+        """Queue a subscription for the next batched frame"""
+        with self.lock:
+            self._pending_subs.setdefault(upstox_mode, []).append(instrument_key)
+            self._arm_batch_timer()
+
+    def _queue_unsubscription(self, instrument_key: str) -> None:
+        """Queue an unsubscription for the next batched frame"""
+        with self.lock:
+            self._pending_unsubs.append(instrument_key)
+            self._arm_batch_timer()
+
+    def _arm_batch_timer(self) -> None:
+        """Start the debounce timer if not already armed (caller holds self.lock)"""
+        if self._batch_timer is None:
+            self._batch_timer = threading.Timer(self._batch_window, self._flush_pending_requests)
+            self._batch_timer.daemon = True
+            self._batch_timer.start()
+
+    def _flush_pending_requests(self) -> None:
+        """Send all queued subscribe/unsubscribe requests, one frame per batch"""
+        with self.lock:
+            self._batch_timer = None
+            pending_subs, self._pending_subs = self._pending_subs, {}
+            pending_unsubs, self._pending_unsubs = self._pending_unsubs, []
+
+        if not self.ws_client or not self.event_loop:
+            return
+
+        try:
+            for upstox_mode, instrument_keys in pending_subs.items():
+                future = asyncio.run_coroutine_threadsafe(
+                    self.ws_client.subscribe(instrument_keys, upstox_mode),
+                    self.event_loop
+                )
+                if not future.result(timeout=5):
+                    self.logger.error(f"Batched subscribe failed for {len(instrument_keys)} instruments in {upstox_mode} mode")
+
+            if pending_unsubs:
+                future = asyncio.run_coroutine_threadsafe(
+                    self.ws_client.unsubscribe(pending_unsubs),
+                    self.event_loop
+                )
+                if not future.result(timeout=5):
+                    self.logger.error(f"Batched unsubscribe failed for {len(pending_unsubs)} instruments")
+
+        except Exception as e:
+            self.logger.error(f"Error flushing batched subscription requests: {e}")
 
     def _create_instrument_key(self, token_info: Dict[str, Any]) -> str:
         """Create instrument key from token info"""
@@ -269,38 +388,35 @@ class UpstoxWebSocketAdapter(BaseBrokerWebSocketAdapter):
 
     def _get_upstox_mode(self, mode: int, depth_level: int) -> str:
         """Convert internal mode to Upstox mode string"""
-        mode_map = {1: "ltpc", 2: "full", 3: "full"}
-        return mode_map.get(mode, "ltpc")
+        return self._UPSTOX_MODES.get(mode, "ltpc")
 
     def _find_subscription_by_feed_key(self, feed_key: str) -> Optional[Dict[str, Any]]:
         """Find subscription info by matching the feed key to stored instrument_key"""
-        with self.lock:
-            self.logger.debug(f"Looking for feed_key: {feed_key}")
-            self.logger.debug(f"Available subscriptions: {list(self.subscriptions.keys())}")
-            
-            # Check all subscriptions to find matching instrument_key
-            for correlation_id, sub_info in self.subscriptions.items():
-                self.logger.debug(f"Checking {correlation_id}: instrument_key={sub_info.get('instrument_key')}")
-                if sub_info.get('instrument_key') == feed_key:
-                    self.logger.info(f"Found subscription match: {correlation_id} for feed_key: {feed_key}")
+        # Lock-free read: writers replace self.subscriptions wholesale
+        subscriptions = self.subscriptions
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Looking for feed_key: %s in subscriptions: %s", feed_key, list(subscriptions.keys()))
+
+        # Check all subscriptions to find matching instrument_key
+        for correlation_id, sub_info in subscriptions.items():
+            if sub_info.get('instrument_key') == feed_key:
+                self.logger.debug("Found subscription match: %s for feed_key: %s", correlation_id, feed_key)
+                return sub_info
+
+        # Fallback: Extract token and try to match
+        if '|' in feed_key:
+            token = feed_key.split('|')[-1]
+            for correlation_id, sub_info in subscriptions.items():
+                if sub_info.get('token') == token:
+                    self.logger.debug("Found token match: %s for token: %s", correlation_id, token)
                     return sub_info
-            
-            # Fallback: Extract token and try to match
-            if '|' in feed_key:
-                token = feed_key.split('|')[-1]
-                self.logger.debug(f"Trying token fallback with token: {token}")
-                for correlation_id, sub_info in self.subscriptions.items():
-                    if sub_info.get('token') == token:
-                        self.logger.info(f"Found token match: {correlation_id} for token: {token}")
-                        return sub_info
         
         self.logger.warning(f"No subscription found for feed key: {feed_key}")
         return None
 
     def _create_topic(self, exchange: str, symbol: str, mode: int) -> str:
         """Create ZMQ topic for publishing"""
-        mode_map = {1: 'LTP', 2: 'QUOTE', 3: 'DEPTH'}
-        mode_str = mode_map.get(mode, 'QUOTE')
+        mode_str = self._MODE_TOPICS.get(mode, 'QUOTE')
         return f"{exchange}_{symbol}_{mode_str}"
 
     # WebSocket event handlers
@@ -309,26 +425,26 @@ class UpstoxWebSocketAdapter(BaseBrokerWebSocketAdapter):
         self.logger.info("Upstox WebSocket connection opened")
         self.connected = True
         
-        # Resubscribe to existing subscriptions on reconnection (Angel pattern)
-        with self.lock:
-            for correlation_id, sub in self.subscriptions.items():
-                try:
-                    instrument_key = sub['instrument_key']
-                    mode = sub['mode']
-                    depth_level = sub['depth_level']
-                    
-                    future = asyncio.run_coroutine_threadsafe(
-                        self.ws_client.subscribe([instrument_key], self._get_upstox_mode(mode, depth_level)),
-                        self.event_loop
-                    )
-                    
-                    if future.result(timeout=5):
-                        self.logger.info(f"Resubscribed to {sub['symbol']}.{sub['exchange']}")
-                    else:
-                        self.logger.warning(f"Failed to resubscribe to {sub['symbol']}.{sub['exchange']}")
-                        
-                except Exception as e:
-                    self.logger.error(f"Error resubscribing to {sub['symbol']}.{sub['exchange']}: {e}")
+        # Resubscribe to existing subscriptions on reconnection (Angel
+        # pattern); iterating a snapshot needs no lock
+        for correlation_id, sub in self.subscriptions.items():
+            try:
+                instrument_key = sub['instrument_key']
+                mode = sub['mode']
+                depth_level = sub['depth_level']
+
+                future = asyncio.run_coroutine_threadsafe(
+                    self.ws_client.subscribe([instrument_key], self._get_upstox_mode(mode, depth_level)),
+                    self.event_loop
+                )
+
+                if future.result(timeout=5):
+                    self.logger.info(f"Resubscribed to {sub['symbol']}.{sub['exchange']}")
+                else:
+                    self.logger.warning(f"Failed to resubscribe to {sub['symbol']}.{sub['exchange']}")
+
+            except Exception as e:
+                self.logger.error(f"Error resubscribing to {sub['symbol']}.{sub['exchange']}: {e}")
 
     async def _on_error(self, error: str):
         """Handle WebSocket errors"""
@@ -373,7 +489,43 @@ class UpstoxWebSocketAdapter(BaseBrokerWebSocketAdapter):
             self.logger.error(f"Reconnection error: {e}")
 
     async def _on_market_data(self, data: Dict[str, Any]):
-        """Handle market data messages"""
+        """Queue decoded feed messages for the consumer thread.
+
+        Runs on the websocket event loop; appending to the ring and
+        returning immediately lets the reader get back to recv() while
+        normalization and publishing happen on the consumer thread.
+        """
+        self._feed_ring.append(data)
+        self._feed_event.set()
+
+    def _start_feed_consumer(self):
+        """Start the feed consumer thread if not already running"""
+        if not self._consumer_thread or not self._consumer_thread.is_alive():
+            self._consumer_thread = threading.Thread(
+                target=self._feed_consumer_loop,
+                daemon=True,
+                name="upstox-feed-consumer"
+            )
+            self._consumer_thread.start()
+            self.logger.info("Started feed consumer thread")
+
+    def _feed_consumer_loop(self):
+        """Drain the feed ring and publish on a dedicated thread"""
+        ring = self._feed_ring
+        event = self._feed_event
+        while self.running:
+            if not ring:
+                event.wait(timeout=1.0)
+                event.clear()
+                continue
+            try:
+                data = ring.popleft()
+            except IndexError:
+                continue
+            self._handle_feed_message(data)
+
+    def _handle_feed_message(self, data: Dict[str, Any]):
+        """Handle a decoded market data message"""
         try:
             # Handle market info messages
             if data.get("type") == "market_info":
@@ -405,23 +557,23 @@ class UpstoxWebSocketAdapter(BaseBrokerWebSocketAdapter):
         try:
             # Find all subscriptions that match this feed key (could be multiple modes)
             matching_subscriptions = []
-            with self.lock:
-                self.logger.debug(f"Looking for matches for feed_key: {feed_key}")
-                self.logger.debug(f"Available subscriptions: {list(self.subscriptions.keys())}")
-                
-                for correlation_id, sub_info in self.subscriptions.items():
-                    # Check instrument_key match
-                    if sub_info.get('instrument_key') == feed_key:
+            # Lock-free read of the copy-on-write subscriptions dict; this
+            # runs for every tick so the reader must not contend with writers
+            subscriptions = self.subscriptions
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Looking for matches for feed_key: %s in subscriptions: %s", feed_key, list(subscriptions.keys()))
+
+            for correlation_id, sub_info in subscriptions.items():
+                # Check instrument_key match
+                if sub_info.get('instrument_key') == feed_key:
+                    matching_subscriptions.append((correlation_id, sub_info))
+                # Check token match as fallback
+                elif '|' in feed_key:
+                    token = feed_key.split('|')[-1]
+                    if sub_info.get('token') == token or sub_info.get('token') == feed_key:
                         matching_subscriptions.append((correlation_id, sub_info))
-                        self.logger.debug(f"Matched by instrument_key: {correlation_id}")
-                    # Check token match as fallback
-                    elif '|' in feed_key:
-                        token = feed_key.split('|')[-1]
-                        if sub_info.get('token') == token or sub_info.get('token') == feed_key:
-                            matching_subscriptions.append((correlation_id, sub_info))
-                            self.logger.debug(f"Matched by token: {correlation_id}")
-                
-                self.logger.info(f"Found {len(matching_subscriptions)} matching subscriptions for {feed_key}")
+
+            self.logger.debug("Found %d matching subscriptions for %s", len(matching_subscriptions), feed_key)
             
             if not matching_subscriptions:
                 self.logger.warning(f"No subscription found for feed key: {feed_key}")
@@ -434,14 +586,12 @@ class UpstoxWebSocketAdapter(BaseBrokerWebSocketAdapter):
                 mode = sub_info['mode']
                 token = sub_info['token']
                 
-                topic = self._create_topic(exchange, symbol, mode)
+                topic = sub_info['topic']
                 market_data = self._extract_market_data(feed_data, sub_info, current_ts)
                 
                 if market_data:
-                    self.logger.info(f"Publishing data for {symbol} mode {mode} on topic: {topic}")
-                    if mode == 2:  # Quote mode - show the complete data structure
-                        self.logger.info(f"QUOTE DATA: {market_data}")
-                    
+                    self.logger.debug("Publishing data for %s mode %d on topic: %s", symbol, mode, topic)
+
                     if mode == 3:  # Depth mode
                         # For depth mode, structure the data properly with LTP at top level
                         depth_data = market_data.copy()
@@ -501,44 +651,29 @@ class UpstoxWebSocketAdapter(BaseBrokerWebSocketAdapter):
             
         full_feed = feed_data["fullFeed"]
         ff = full_feed.get("marketFF") or full_feed.get("indexFF", {})
-        
-        # Log the full feed structure to understand available fields
-        self.logger.info(f"Full feed structure for quote extraction: {list(ff.keys())}")
-        
+
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Full feed structure for quote extraction: %s", list(ff.keys()))
+
         # Extract LTP and quantity data
         ltpc = ff.get("ltpc", {})
         ltp = ltpc.get("ltp", 0)
         ltq = ltpc.get("ltq", 0)  # Last traded quantity
-        
+
         # Extract OHLC data
         ohlc_list = ff.get("marketOHLC", {}).get("ohlc", [])
         ohlc = next((o for o in ohlc_list if o.get("interval") == "1d"), ohlc_list[0] if ohlc_list else {})
-        
-        # Extract market level data - try different possible field names
-        market_level = ff.get("marketLevel", {})
-        self.logger.info(f"Market level keys: {list(market_level.keys()) if market_level else 'None'}")
-        
-        # Also check what's in OHLC
-        self.logger.info(f"OHLC keys: {list(ohlc.keys()) if ohlc else 'None'}")
-        
-        # Check if there are other sections with volume data
-        if "marketStatus" in ff:
-            self.logger.info(f"Market status keys: {list(ff['marketStatus'].keys())}")
-        if "optionGreeks" in ff:
-            self.logger.info(f"Option Greeks keys: {list(ff['optionGreeks'].keys())}")
-        
+
         # Extract volume from OHLC (confirmed working)
         volume = ohlc.get("vol", 0) if ohlc else 0
-        
+
         # Extract average price from 'atp' field (Average Traded Price)
         avg_price = float(ff.get("atp", 0))
-        
+
         # Extract buy/sell quantities from 'tbq' and 'tsq' fields
         total_buy_qty = int(ff.get("tbq", 0))  # Total Buy Quantity
         total_sell_qty = int(ff.get("tsq", 0))  # Total Sell Quantity
-        
-        self.logger.debug(f"Extracted values - volume: {volume}, atp: {avg_price}, tbq: {total_buy_qty}, tsq: {total_sell_qty}")
-        
+
         market_data = base_data.copy()
         market_data.update({
             "open": float(ohlc.get("open", 0)),
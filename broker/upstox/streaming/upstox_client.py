@@ -1,16 +1,141 @@
 # broker/upstox/streaming/upstox_client.py
 import asyncio
+import itertools
 import json
+import os
 import ssl
 import websockets
 import logging
-import uuid
 from typing import Dict, Any, Optional, List, Callable
-from google.protobuf.json_format import MessageToDict
 import requests
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    # Fall back to stdlib json if orjson is unavailable
+    _json_loads = json.loads
+
+# Prefer the upb/C++ protobuf backend; the pure-Python fallback decodes
+# feeds 10-50x slower. Must be set before the generated module is imported.
+os.environ.setdefault("PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION", "upb")
+
 from . import MarketDataFeedV3_pb2
 
+try:
+    from google.protobuf.internal import api_implementation
+    _PROTOBUF_IMPLEMENTATION = api_implementation.Type()
+except ImportError:
+    _PROTOBUF_IMPLEMENTATION = "unknown"
+
+if _PROTOBUF_IMPLEMENTATION not in ("cpp", "upb"):
+    logging.getLogger("upstox_websocket").error(
+        "google.protobuf is using the slow '%s' implementation; "
+        "market data decoding will be significantly slower. "
+        "Install protobuf>=4.21 so the upb backend is available.",
+        _PROTOBUF_IMPLEMENTATION
+    )
+
+# Decoder specialized to the vendored MarketDataFeedV3 schema. The schema is
+# fixed at codegen time, so decoding is straight-line attribute reads with no
+# descriptor reflection, and module-level functions skip the bound-method and
+# self lookups a per-tick instance method would pay.
+_TYPE_NAME = MarketDataFeedV3_pb2.Type.Name
+_MARKET_STATUS_NAME = MarketDataFeedV3_pb2.MarketStatus.Name
+
+
+def _extract_ltpc(ltpc):
+    """Extract LTPC fields"""
+    return {"ltp": ltpc.ltp, "ltt": ltpc.ltt, "ltq": ltpc.ltq, "cp": ltpc.cp}
+
+
+def _extract_ohlc_list(market_ohlc):
+    """Extract marketOHLC interval candles"""
+    return {
+        "ohlc": [
+            {
+                "interval": o.interval,
+                "open": o.open,
+                "high": o.high,
+                "low": o.low,
+                "close": o.close,
+                "vol": o.vol,
+                "ts": o.ts
+            }
+            for o in market_ohlc.ohlc
+        ]
+    }
+
+
+def _extract_market_ff(market_ff, _extract_ltpc=_extract_ltpc, _extract_ohlc_list=_extract_ohlc_list):
+    """Extract MarketFullFeed fields consumed by the adapter"""
+    return {
+        "ltpc": _extract_ltpc(market_ff.ltpc),
+        "marketOHLC": _extract_ohlc_list(market_ff.marketOHLC),
+        "marketLevel": {
+            "bidAskQuote": [
+                {"bidQ": q.bidQ, "bidP": q.bidP, "askQ": q.askQ, "askP": q.askP}
+                for q in market_ff.marketLevel.bidAskQuote
+            ]
+        },
+        "atp": market_ff.atp,
+        "tbq": market_ff.tbq,
+        "tsq": market_ff.tsq
+    }
+
+
+def _extract_index_ff(index_ff, _extract_ltpc=_extract_ltpc, _extract_ohlc_list=_extract_ohlc_list):
+    """Extract IndexFullFeed fields consumed by the adapter"""
+    return {
+        "ltpc": _extract_ltpc(index_ff.ltpc),
+        "marketOHLC": _extract_ohlc_list(index_ff.marketOHLC)
+    }
+
+
+def _extract_feed(feed, _extract_ltpc=_extract_ltpc, _extract_market_ff=_extract_market_ff,
+                  _extract_index_ff=_extract_index_ff):
+    """Extract a single Feed message into the dict shape the adapter expects"""
+    case = feed.WhichOneof("FeedUnion")
+
+    if case == "ltpc":
+        return {"ltpc": _extract_ltpc(feed.ltpc)}
+
+    if case == "fullFeed":
+        full_feed = feed.fullFeed
+        if full_feed.WhichOneof("FullFeedUnion") == "marketFF":
+            return {"fullFeed": {"marketFF": _extract_market_ff(full_feed.marketFF)}}
+        return {"fullFeed": {"indexFF": _extract_index_ff(full_feed.indexFF)}}
+
+    if case == "firstLevelWithGreeks":
+        return {"firstLevelWithGreeks": {"ltpc": _extract_ltpc(feed.firstLevelWithGreeks.ltpc)}}
+
+    return {}
+
+
+def _decode_feed_response(feed_response, _TYPE_NAME=_TYPE_NAME, _MARKET_STATUS_NAME=_MARKET_STATUS_NAME,
+                          _extract_feed=_extract_feed):
+    """Convert a parsed FeedResponse into the dict shape the adapter expects"""
+    data = {
+        "type": _TYPE_NAME(feed_response.type),
+        "currentTs": feed_response.currentTs
+    }
+
+    if feed_response.feeds:
+        data["feeds"] = {
+            key: _extract_feed(feed)
+            for key, feed in feed_response.feeds.items()
+        }
+
+    if feed_response.HasField("marketInfo"):
+        data["marketInfo"] = {
+            "segmentStatus": {
+                segment: _MARKET_STATUS_NAME(status)
+                for segment, status in feed_response.marketInfo.segmentStatus.items()
+            }
+        }
+
+    return data
+
 
 class UpstoxWebSocketClient:
     """
@@ -20,7 +145,20 @@ class UpstoxWebSocketClient:
     
     API_URL = "https://api.upstox.com/v3"
     AUTH_ENDPOINT = f"{API_URL}/feed/market-data-feed/authorize"
-    
+
+    # Precomputed envelopes for sub/unsub requests; splicing the guid, mode
+    # and instrument keys into a template skips the dict -> JSON encoder
+    # traversal on every call while producing identical bytes
+    _SUB_TMPL = '{{"guid": "{guid}", "method": "sub", "data": {{"instrumentKeys": {keys}, "mode": "{mode}"}}}}'
+    _UNSUB_TMPL = '{{"guid": "{guid}", "method": "unsub", "data": {{"instrumentKeys": {keys}}}}}'
+
+    # Receive-side batching: after one frame arrives, frames already sitting
+    # in the protocol buffer are drained and processed in a tight loop,
+    # amortizing the per-message event-loop round trip over the batch
+    _DRAIN_TIMEOUT = 0.001
+    _MAX_DRAIN_BATCH = 128
+
+
     def __init__(self, auth_token: str):
         self.auth_token = auth_token
         self.websocket: Optional[websockets.WebSocketClientProtocol] = None
@@ -39,6 +177,15 @@ class UpstoxWebSocketClient:
             "base_delay": 2,
             "max_delay": 30
         }
+        # Cheap per-session guid generation; the broker only needs
+        # correlation ids unique within the session, so a pid-prefixed
+        # counter avoids the urandom read and hex formatting of uuid4
+        self._guid_prefix = f"{os.getpid():x}-"
+        self._guid_counter = itertools.count()
+        # Reused across ticks; protobuf message construction is expensive
+        # and decoding is serialized on the event loop, so one instance
+        # cleared per message is safe
+        self._feed_response = MarketDataFeedV3_pb2.FeedResponse()
 
     async def connect(self) -> bool:
         """Establish WebSocket connection with reconnection logic"""
@@ -83,7 +230,7 @@ class UpstoxWebSocketClient:
             message = self._create_subscription_message(instrument_keys, mode, "sub")
             await self._send_message(message)
             self._subscriptions.update(instrument_keys)
-            self.logger.info(f"Subscribed to {len(instrument_keys)} instruments in {mode} mode")
+            self.logger.info("Subscribed to %d instruments in %s mode", len(instrument_keys), mode)
             return True
             
         except Exception as e:
@@ -100,7 +247,7 @@ class UpstoxWebSocketClient:
             message = self._create_subscription_message(instrument_keys, method="unsub")
             await self._send_message(message)
             self._subscriptions.difference_update(instrument_keys)
-            self.logger.info(f"Unsubscribed from {len(instrument_keys)} instruments")
+            self.logger.info("Unsubscribed from %d instruments", len(instrument_keys))
             return True
             
         except Exception as e:
@@ -147,7 +294,14 @@ class UpstoxWebSocketClient:
             }
             
             self.logger.debug("Requesting WebSocket authorization")
-            response = requests.get(self.AUTH_ENDPOINT, headers=headers)
+            # The event loop is shared with other adapters, so the blocking
+            # HTTP round trip must run on an executor thread with a timeout
+            # rather than stalling recv/subscribe for every connected user
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(
+                None,
+                lambda: requests.get(self.AUTH_ENDPOINT, headers=headers, timeout=10)
+            )
             response.raise_for_status()
             
             auth_data = response.json()
@@ -183,23 +337,21 @@ class UpstoxWebSocketClient:
         delay = self._reconnect_config["base_delay"] * (2 ** (attempt - 1))
         return min(delay, self._reconnect_config["max_delay"])
 
-    def _create_subscription_message(self, instrument_keys: List[str], mode: str = None, method: str = "sub") -> Dict[str, Any]:
-        """Create subscription/unsubscription message"""
-        message = {
-            "guid": str(uuid.uuid4()).replace("-", "")[:20],
-            "method": method,
-            "data": {"instrumentKeys": instrument_keys}
-        }
-        
+    def _create_subscription_message(self, instrument_keys: List[str], mode: str = None, method: str = "sub") -> str:
+        """Create subscription/unsubscription message from the precomputed template"""
+        guid = f"{self._guid_prefix}{next(self._guid_counter):x}"
+        # Instrument keys are broker-sanitized (EXCHANGE|token), so they can
+        # be spliced into the JSON array without escaping
+        keys_json = '["' + '", "'.join(instrument_keys) + '"]'
+
         if mode and method == "sub":
-            message["data"]["mode"] = mode
-        
-        return message
+            return self._SUB_TMPL.format(guid=guid, mode=mode, keys=keys_json)
+        return self._UNSUB_TMPL.format(guid=guid, keys=keys_json)
 
-    async def _send_message(self, message: Dict[str, Any]) -> None:
+    async def _send_message(self, message: str) -> None:
         """Send message to WebSocket"""
-        self.logger.debug(f"Sending: {json.dumps(message, indent=2)}")
-        await self.websocket.send(json.dumps(message).encode('utf-8'))
+        self.logger.debug("Sending: %s", message)
+        await self.websocket.send(message.encode('utf-8'))
 
     async def _trigger_callback(self, callback_name: str, *args) -> None:
         """Trigger callback if it exists"""
@@ -213,62 +365,88 @@ class UpstoxWebSocketClient:
         await self._trigger_callback("on_error", error_message)
 
     def _decode_protobuf_to_dict(self, buffer: bytes) -> Dict[str, Any]:
-        """Decode protobuf FeedResponse to dictionary"""
-        feed_response = MarketDataFeedV3_pb2.FeedResponse()
-        feed_response.ParseFromString(buffer)
-        return MessageToDict(feed_response)
+        """Decode protobuf FeedResponse to dictionary.
+
+        Parses into the reused message instance and hands off to the
+        module-level decoder specialized to the MarketDataFeedV3 schema.
+        """
+        feed_response = self._feed_response
+        feed_response.Clear()
+        feed_response.MergeFromString(buffer)
+        return _decode_feed_response(feed_response)
 
     async def _message_handler(self) -> None:
         """Handle incoming WebSocket messages"""
+        # This loop runs once per tick, so hoist the per-frame attribute and
+        # dict lookups (recv, processors) into locals outside the loop.
+        recv = self.websocket.recv
+        process_binary = self._process_binary_message
+        process_text = self._process_text_message
+        wait_for = asyncio.wait_for
+        drain_timeout = self._DRAIN_TIMEOUT
+        max_batch = self._MAX_DRAIN_BATCH
+
         try:
             while self.running and self.websocket:
                 try:
-                    message = await self.websocket.recv()
-                    await self._process_message(message)
-                    
+                    batch = [await recv()]
+
+                    # Drain frames that are already buffered; recv is safe to
+                    # cancel, and a closed connection surfaces again on the
+                    # next blocking recv above
+                    while len(batch) < max_batch:
+                        try:
+                            batch.append(await wait_for(recv(), drain_timeout))
+                        except (asyncio.TimeoutError, websockets.exceptions.ConnectionClosed):
+                            break
+
+                    for message in batch:
+                        if type(message) is bytes:
+                            await process_binary(message)
+                        else:
+                            await process_text(message)
+
                 except websockets.exceptions.ConnectionClosed:
                     self.logger.info("WebSocket connection closed")
                     await self._trigger_callback("on_close")
                     break
-                    
+
         except Exception as e:
             self.logger.error(f"Message handler error: {e}")
             await self._trigger_error(str(e))
 
-    async def _process_message(self, message) -> None:
-        """Process incoming message based on type"""
-        if isinstance(message, bytes):
-            await self._process_binary_message(message)
-        else:
-            await self._process_text_message(message)
-
     async def _process_binary_message(self, message: bytes) -> None:
         """Process binary (protobuf) message"""
         try:
-            self._log_binary_message("IN", message)
             data = self._decode_protobuf_to_dict(message)
-            self.logger.debug(f"Decoded protobuf: {json.dumps(data, indent=2)}")
-            await self._trigger_callback("on_message", data)
-            
+            # Guard so the hex preview and repr are only built when DEBUG
+            # records are actually emitted; this runs for every tick
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self._log_binary_message("IN", message)
+                self.logger.debug("Decoded protobuf: %r", data)
+            callback = self.callbacks["on_message"]
+            if callback:
+                await callback(data)
+
         except Exception as e:
             self.logger.error(f"Failed to process binary message: {e}")
 
     async def _process_text_message(self, message: str) -> None:
         """Process text (JSON) message"""
         try:
-            data = json.loads(message)
-            self.logger.debug(f"Received JSON: {json.dumps(data, indent=2)}")
-            
+            data = _json_loads(message)
+            self.logger.debug("Received JSON: %r", data)
+
             # Handle error responses
             if data.get("status") == "failed" and data.get("error"):
                 method = data.get("method", "unknown")
                 error_msg = f"{method.capitalize()} failed: {data['error']}"
                 await self._trigger_error(error_msg)
-                
-        except json.JSONDecodeError as e:
+
+        except ValueError as e:
             self.logger.error(f"Failed to parse JSON message: {e}")
 
     def _log_binary_message(self, direction: str, message: bytes) -> None:
         """Log binary message with hex preview"""
         hex_preview = ' '.join(f'{b:02x}' for b in message[:16])
-        self.logger.debug(f"WebSocket {direction}: Binary message ({len(message)} bytes), preview: {hex_preview}")
\ No newline at end of file
+        self.logger.debug("WebSocket %s: Binary message (%d bytes), preview: %s", direction, len(message), hex_preview)
\ No newline at end of file
@@ -1,4 +1,5 @@
 # broker/upstox/streaming/upstox_mapping.py
+from functools import lru_cache
 from typing import Dict, Set
 import logging
 
@@ -48,30 +49,14 @@ class UpstoxExchangeMapper:
     def get_exchange_type(exchange):
         """
         Convert OpenAlgo exchange code to Upstox specific exchange type
-        
+
         Args:
             exchange: Exchange code (e.g., 'NSE', 'BSE', 'NFO')
-            
+
         Returns:
             str: Exchange type code for Upstox API
         """
-        if exchange is None:
-            logging.warning("Exchange is None, defaulting to NSE_EQ")
-            return 'NSE_EQ'
-            
-        # Convert to string and uppercase
-        exchange = str(exchange).upper().strip()
-        
-        # Try to find the exchange in our mapping
-        exchange_code = UpstoxExchangeMapper.EXCHANGE_TYPES.get(exchange)
-        
-        if exchange_code is not None:
-            logging.info(f"Mapped exchange '{exchange}' to code {exchange_code}")
-            return exchange_code
-            
-        # If we get here, log a warning and default to NSE_EQ
-        logging.warning(f"Unknown exchange '{exchange}', defaulting to NSE_EQ")
-        return 'NSE_EQ'
+        return _get_exchange_type(exchange)
     
     @staticmethod
     def get_openalgo_exchange(upstox_code):
@@ -86,6 +71,42 @@ class UpstoxExchangeMapper:
         """
         return UpstoxExchangeMapper.REVERSE_EXCHANGE_TYPES.get(upstox_code, 'NSE')  # Default to NSE if not found
 
+
+@lru_cache(maxsize=64)
+def _get_exchange_type(exchange):
+    """Resolve an exchange code to its Upstox type, memoized per input.
+
+    The input domain is a couple of dozen codes, and subscribe/unsubscribe
+    resolve the same exchange repeatedly, so cache the normalization and
+    lookup (and the log noise along with it).
+    """
+    if exchange is None:
+        logging.warning("Exchange is None, defaulting to NSE_EQ")
+        return 'NSE_EQ'
+
+    # Fast path: the adapter passes codes already uppercase, and the stored
+    # keys are uppercase, so try the raw string before paying for the
+    # str/upper/strip allocations
+    if type(exchange) is str:
+        exchange_code = UpstoxExchangeMapper.EXCHANGE_TYPES.get(exchange)
+        if exchange_code is not None:
+            return exchange_code
+
+    # Convert to string and uppercase
+    normalized = str(exchange).upper().strip()
+
+    # Try to find the exchange in our mapping
+    exchange_code = UpstoxExchangeMapper.EXCHANGE_TYPES.get(normalized)
+
+    if exchange_code is not None:
+        logging.info(f"Mapped exchange '{normalized}' to code {exchange_code}")
+        return exchange_code
+
+    # If we get here, log a warning and default to NSE_EQ
+    logging.warning(f"Unknown exchange '{normalized}', defaulting to NSE_EQ")
+    return 'NSE_EQ'
+
+
 class UpstoxCapabilityRegistry:
     """Registry of Upstox capabilities and limits"""
     